@@ -10,7 +10,7 @@ if %ERRORLEVEL% NEQ 0 (
 
 :: Install required packages
 echo Installing required Python packages...
-pip install pandas openpyxl
+pip install xlsxwriter
 
 echo Installation complete!
 echo You can now run the converter using: python rvtools_csv2excel.py
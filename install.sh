@@ -11,7 +11,7 @@ fi
 
 # Install required packages
 echo "Installing required Python packages..."
-pip install pandas openpyxl
+pip install xlsxwriter
 
 # Make the script executable
 chmod +x rvtools_csv2excel.py
@@ -9,7 +9,7 @@ Features:
 - Convert single or multiple CSV files to a single Excel workbook
 - Scan directories for CSV files
 - Apply RVTools-style formatting
-- Preserve data types
+- Write cell values as text, exactly as they appear in the CSV
 - Reorder sheets to match standard RVTools order
 - Add metadata sheet
 
@@ -28,12 +28,12 @@ Options:
 import os
 import sys
 import argparse
-import pandas as pd
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
-from openpyxl.utils import get_column_letter
+import csv
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import xlsxwriter
 from datetime import datetime
-import re
 import traceback
 
 # Define standard RVTools sheet order
@@ -44,6 +44,21 @@ STANDARD_SHEET_ORDER = [
     'vLicense', 'vFileInfo', 'vHealth', 'vMetaData'
 ]
 
+# Characters Excel does not allow in sheet names, stripped via str.translate
+SHEET_NAME_TRANS = str.maketrans('', '', '[]:*?/\\')
+
+# Shared cell style properties; each is registered once per workbook so every
+# sheet reuses the same compiled format record
+HEADER_STYLE = {'font_name': 'Verdana', 'font_size': 9, 'bold': True,
+                'font_color': 'white', 'bg_color': 'black', 'align': 'left'}
+DATA_STYLE = {'font_name': 'Verdana', 'font_size': 9, 'align': 'left'}
+
+# Conditional styles only override the font color; the base Verdana style
+# comes from the data format on the cells themselves
+RED_STYLE = {'font_color': '#FF0000'}
+GREEN_STYLE = {'font_color': '#008000'}
+ORANGE_STYLE = {'font_color': '#FFA500'}
+
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description='Convert RVTools CSV exports to Excel format')
@@ -62,23 +77,26 @@ def find_csv_files(directory, recursive=False, prefix=None, verbose=False):
     if verbose:
         print(f"Scanning for CSV files in {directory}" + (" and subdirectories" if recursive else ""))
     
-    if recursive:
-        for root, _, files in os.walk(directory):
-            for file in files:
-                if file.lower().endswith('.csv'):
-                    if prefix is None or file.startswith(prefix):
-                        csv_files.append(os.path.join(root, file))
-    else:
-        for file in os.listdir(directory):
-            if file.lower().endswith('.csv'):
-                if prefix is None or file.startswith(prefix):
-                    csv_files.append(os.path.join(directory, file))
+    # Walk with os.scandir: DirEntry caches the file type from the directory
+    # read, avoiding an extra stat call per entry
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(entry.path)
+                elif entry.name.lower().endswith('.csv'):
+                    if prefix is None or entry.name.startswith(prefix):
+                        csv_files.append(entry.path)
     
     if verbose:
         print(f"Found {len(csv_files)} CSV files")
     
     return csv_files
 
+@lru_cache(maxsize=512)
 def get_sheet_name_from_filename(filename, prefix='RVTools_tab'):
     """Extract a suitable sheet name from the CSV filename."""
     base_name = os.path.basename(filename)
@@ -91,254 +109,317 @@ def get_sheet_name_from_filename(filename, prefix='RVTools_tab'):
         sheet_name = os.path.splitext(base_name)[0]
     
     # Ensure sheet name is valid for Excel (max 31 chars, no special chars)
-    sheet_name = re.sub(r'[\[\]:*?/\\]', '', sheet_name)  # Remove invalid chars
+    sheet_name = sheet_name.translate(SHEET_NAME_TRANS)  # Remove invalid chars
     sheet_name = sheet_name[:31]  # Truncate if too long
     
     return sheet_name
 
-def apply_header_formatting(worksheet):
-    """Apply formatting to the header row of the worksheet."""
-    # Define header style (black background, white text, bold)
-    header_font = Font(name='Verdana', size=9, bold=True, color='FFFFFF')
-    header_fill = PatternFill(start_color='000000', end_color='000000', fill_type='solid')
-    header_alignment = Alignment(horizontal='left')
-    
-    # Apply formatting to header row
-    for cell in worksheet[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-
-def apply_data_formatting(worksheet):
-    """Apply formatting to the data rows of the worksheet."""
-    # Define data row style
-    data_font = Font(name='Verdana', size=9)
-    data_alignment = Alignment(horizontal='left')
-    
-    # Apply formatting to data rows
-    for row in worksheet.iter_rows(min_row=2):
-        for cell in row:
-            cell.font = data_font
-            cell.alignment = data_alignment
-            
-            # Apply conditional formatting for specific columns
-            column_name = worksheet.cell(row=1, column=cell.column).value
-            
-            # Format Powerstate column
-            if column_name == 'Powerstate' and cell.value == 'poweredOff':
-                cell.font = Font(name='Verdana', size=9, color='FF0000')  # Red text for powered off VMs
-            
-            # Format Config status column
-            if column_name == 'Config status':
-                if cell.value == 'green':
-                    cell.font = Font(name='Verdana', size=9, color='008000')  # Green text
-                elif cell.value == 'red':
-                    cell.font = Font(name='Verdana', size=9, color='FF0000')  # Red text
-                elif cell.value == 'yellow':
-                    cell.font = Font(name='Verdana', size=9, color='FFA500')  # Orange text
-            
-            # Format boolean values consistently
-            if isinstance(cell.value, bool):
-                cell.value = str(cell.value)
-
-def auto_adjust_column_width(worksheet):
-    """Adjust column widths based on content."""
-    for column in worksheet.columns:
-        max_length = 0
-        column_letter = get_column_letter(column[0].column)
-        
-        # Find the maximum content length in the column
-        for cell in column:
-            if cell.value:
-                try:
-                    cell_length = len(str(cell.value))
-                    if cell_length > max_length:
-                        max_length = cell_length
-                except:
-                    pass
-        
-        # Set the column width (with some padding)
+def unique_sheet_name(sheet_name, used_names):
+    """Return sheet_name, suffixed with a counter if it is already taken.
+
+    xlsxwriter raises on duplicate worksheet names, but duplicates are
+    legitimate input: RVTools' own CSV export includes a vMetaData file,
+    and recursive scans can find same-named files in different
+    subdirectories. Mirrors openpyxl's auto-rename (vMetaData -> vMetaData1).
+    """
+    if sheet_name not in used_names:
+        return sheet_name
+
+    counter = 1
+    while True:
+        suffix = str(counter)
+        candidate = sheet_name[:31 - len(suffix)] + suffix
+        if candidate not in used_names:
+            return candidate
+        counter += 1
+
+def adjust_column_widths(max_lengths):
+    """Turn per-column max content lengths into padded column widths."""
+    widths = []
+    for max_length in max_lengths:
         adjusted_width = max_length + 2
         if adjusted_width > 100:  # Cap the width for very long content
             adjusted_width = 100
         elif adjusted_width < 8:  # Minimum width
             adjusted_width = 8
-        worksheet.column_dimensions[column_letter].width = adjusted_width
+        widths.append(adjusted_width)
+
+    return widths
+
+def set_column_widths(worksheet, widths):
+    """Apply precomputed column widths to a worksheet."""
+    for col_idx, width in enumerate(widths):
+        worksheet.set_column(col_idx, col_idx, width)
+
+def detect_encoding(csv_file):
+    """Detect the text encoding of a CSV file from a sample read.
+
+    RVTools exports in one directory share an encoding in practice, so the
+    caller detects it once on the first file and reuses it for the rest.
+    """
+    try:
+        # Sniff on raw bytes with a generous sample; a 64KB read covers the
+        # header plus enough data rows to catch non-ASCII content early
+        with open(csv_file, 'rb') as f:
+            sample = f.read(65536)
+    except OSError:
+        return 'latin1'
 
-def clean_csv_data(csv_file, verbose=False):
-    """Clean and prepare CSV data for Excel conversion."""
     try:
-        # Try to detect the encoding and delimiter
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            sample = f.read(4096)
-        
-        # Check if we need to handle quoted fields with commas
-        has_quotes = '"' in sample
-        
-        # Read the CSV file with pandas
-        if has_quotes:
-            df = pd.read_csv(csv_file, encoding='utf-8', quotechar='"', escapechar='\\')
-        else:
-            df = pd.read_csv(csv_file, encoding='utf-8')
-        
+        sample.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # A decode error in the last few bytes may just be a multibyte
+        # character truncated by the sample boundary
+        if e.start < len(sample) - 4:
+            return 'latin1'
+
+    return 'utf-8'
+
+def read_csv_rows(csv_file, encoding, errors='strict'):
+    """Read a CSV file into a (header, rows, widths) tuple.
+
+    Column widths are tracked while the rows stream in, so no separate
+    pass over the data is needed to size the columns.
+    """
+    # A 1MB buffer keeps the reader in large sequential reads instead of
+    # the default 8KB chunks
+    with open(csv_file, 'r', newline='', encoding=encoding, errors=errors,
+              buffering=1 << 20) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return None
+
         # Clean column names (remove extra whitespace)
-        df.columns = [col.strip() for col in df.columns]
-        
-        if verbose:
-            print(f"  - Read {len(df)} rows and {len(df.columns)} columns")
-        
-        return df
+        header = [col.strip() for col in header]
+
+        # Track the maximum content length per column as rows stream in;
+        # csv.reader only yields strings, so len applies directly
+        max_lengths = [len(column_name) for column_name in header]
+        num_columns = len(max_lengths)
+        rows = []
+        for row in reader:
+            for col_idx, value in enumerate(row):
+                if value and col_idx < num_columns:
+                    cell_length = len(value)
+                    if cell_length > max_lengths[col_idx]:
+                        max_lengths[col_idx] = cell_length
+            rows.append(row)
+
+    return header, rows, adjust_column_widths(max_lengths)
+
+def clean_csv_data(csv_file, verbose=False, encoding='utf-8'):
+    """Clean and prepare CSV data for Excel conversion."""
+    # latin1 accepts every byte sequence, so a cached latin1 encoding would
+    # silently turn UTF-8 files into mojibake in mixed directories. Try a
+    # strict utf-8 read first: if it succeeds the file is utf-8, and only a
+    # real decode error falls through to latin1.
+    if encoding == 'latin1':
+        try:
+            result = read_csv_rows(csv_file, 'utf-8')
+
+            if result is not None and verbose:
+                header, rows, _ = result
+                print(f"  - Read {len(rows)} rows and {len(header)} columns")
+
+            return result
+        except UnicodeDecodeError:
+            pass
+
+    try:
+        result = read_csv_rows(csv_file, encoding)
+
+        if result is not None and verbose:
+            header, rows, _ = result
+            print(f"  - Read {len(rows)} rows and {len(header)} columns")
+
+        return result
     except Exception as e:
         if verbose:
-            print(f"  - Error reading with UTF-8: {str(e)}")
-        
+            print(f"  - Error reading with {encoding}: {str(e)}")
+
         # Try with different encoding if UTF-8 fails
         try:
-            if has_quotes:
-                df = pd.read_csv(csv_file, encoding='latin1', quotechar='"', escapechar='\\')
-            else:
-                df = pd.read_csv(csv_file, encoding='latin1')
-                
-            df.columns = [col.strip() for col in df.columns]
-            
-            if verbose:
-                print(f"  - Successfully read with latin1 encoding: {len(df)} rows")
-            
-            return df
+            result = read_csv_rows(csv_file, 'latin1')
+
+            if result is not None and verbose:
+                print(f"  - Successfully read with latin1 encoding: {len(result[1])} rows")
+
+            return result
         except Exception as e2:
             if verbose:
                 print(f"  - Failed with alternative encoding: {str(e2)}")
-            
-            # Last resort: try with different quoting options
+
+            # Last resort: replace undecodable bytes instead of failing
             try:
-                df = pd.read_csv(csv_file, quoting=3)  # QUOTE_NONE
-                df.columns = [col.strip() for col in df.columns]
-                
-                if verbose:
-                    print(f"  - Successfully read with QUOTE_NONE: {len(df)} rows")
-                
-                return df
+                result = read_csv_rows(csv_file, 'utf-8', errors='replace')
+
+                if result is not None and verbose:
+                    print(f"  - Successfully read with replacement characters: {len(result[1])} rows")
+
+                return result
             except Exception as e3:
                 if verbose:
                     print(f"  - All reading attempts failed: {str(e3)}")
                 return None
 
+def parse_csv_file(csv_file, prefix='RVTools_tab', verbose=False, encoding='utf-8'):
+    """Parse a single CSV file into a (sheet_name, header, rows, widths) tuple.
+
+    Runs in a worker process; returns None if the file could not be read.
+    """
+    sheet_name = get_sheet_name_from_filename(csv_file, prefix)
+
+    result = clean_csv_data(csv_file, verbose, encoding)
+    if result is None:
+        return None
+
+    header, rows, widths = result
+    return sheet_name, header, rows, widths
+
 def convert_csv_to_excel(csv_files, output_file, prefix='RVTools_tab', verbose=False):
     """Convert CSV files to Excel format with proper formatting."""
-    # Create a new Excel workbook
-    workbook = openpyxl.Workbook()
-    
-    # Remove the default sheet
-    default_sheet = workbook.active
-    workbook.remove(default_sheet)
-    
-    # Track processed sheets for ordering
-    processed_sheets = []
-    
-    # Process each CSV file
-    for csv_file in csv_files:
+    # Create the workbook with xlsxwriter in constant_memory mode: rows are
+    # streamed to disk as they are written and formats are pre-compiled
+    workbook = xlsxwriter.Workbook(output_file, {
+        'constant_memory': True,
+        'strings_to_numbers': False,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+    })
+
+    # Register the shared cell formats once; xlsxwriter reuses them across
+    # every sheet in the workbook
+    header_format = workbook.add_format(HEADER_STYLE)
+    data_format = workbook.add_format(DATA_STYLE)
+    red_format = workbook.add_format(RED_STYLE)
+    green_format = workbook.add_format(GREEN_STYLE)
+    orange_format = workbook.add_format(ORANGE_STYLE)
+
+    # Create the sheets directly in their final order: sort the files by
+    # their sheet's standard position (unknown sheets keep discovery order
+    # after the known ones, vMetaData is added last). This removes the need
+    # to reorder anything after the rows have been streamed out.
+    order_index = {name: idx for idx, name in enumerate(STANDARD_SHEET_ORDER)}
+    csv_files = sorted(csv_files,
+                       key=lambda f: order_index.get(
+                           get_sheet_name_from_filename(f, prefix),
+                           len(STANDARD_SHEET_ORDER)))
+
+    # Sniff the encoding once on the first file; every worker reuses it and
+    # only falls back per file if that file alone disagrees
+    encoding = detect_encoding(csv_files[0]) if csv_files else 'utf-8'
+
+    if verbose:
+        print(f"Detected encoding: {encoding}")
+
+    # Track the sheet names already taken so duplicates can be renamed
+    used_sheet_names = set()
+
+    # Parse CSV files in parallel; writing stays on the main process since
+    # the workbook is not safe to share across workers
+    executor = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+    # Submit a bounded window of files and consume in submission order: the
+    # sheet layout stays deterministic and parsing still overlaps across
+    # cores, but only a window's worth of parsed rows waits in memory
+    # instead of the entire export
+    window_size = (os.cpu_count() or 1) + 1
+    pending = deque()
+    next_file = 0
+
+    while pending or next_file < len(csv_files):
+        while next_file < len(csv_files) and len(pending) < window_size:
+            pending.append((csv_files[next_file],
+                            executor.submit(parse_csv_file, csv_files[next_file],
+                                            prefix, verbose, encoding)))
+            next_file += 1
+
+        csv_file, future = pending.popleft()
         try:
             if verbose:
                 print(f"Processing {csv_file}")
-            
-            # Get sheet name from filename
-            sheet_name = get_sheet_name_from_filename(csv_file, prefix)
-            
-            if verbose:
-                print(f"  - Sheet name: {sheet_name}")
-            
-            # Clean and read CSV data
-            df = clean_csv_data(csv_file, verbose)
-            if df is None:
+
+            parsed = future.result()
+            if parsed is None:
                 if verbose:
                     print(f"  - Skipping file due to read errors")
                 continue
-            
+            sheet_name, columns, rows, widths = parsed
+
+            # Rename collisions instead of letting add_worksheet raise
+            sheet_name = unique_sheet_name(sheet_name, used_sheet_names)
+            used_sheet_names.add(sheet_name)
+
+            if verbose:
+                print(f"  - Sheet name: {sheet_name}")
+
             # Create a sheet
-            worksheet = workbook.create_sheet(title=sheet_name)
-            processed_sheets.append(sheet_name)
-            
+            worksheet = workbook.add_worksheet(sheet_name)
+
+            # Column widths and the frozen header row
+            set_column_widths(worksheet, widths)
+            worksheet.freeze_panes(1, 0)
+
             # Write header
-            for col_idx, column_name in enumerate(df.columns, start=1):
-                cell = worksheet.cell(row=1, column=col_idx)
-                cell.value = column_name
-            
+            worksheet.write_row(0, 0, columns, header_format)
+
             # Write data
-            for row_idx, row_data in df.iterrows():
-                for col_idx, value in enumerate(row_data, start=1):
-                    cell = worksheet.cell(row=row_idx + 2, column=col_idx)
-                    cell.value = value
-            
-            # Apply formatting
-            if verbose:
-                print(f"  - Applying formatting")
-            
-            apply_header_formatting(worksheet)
-            apply_data_formatting(worksheet)
-            auto_adjust_column_width(worksheet)
-            
-            # Freeze the header row
-            worksheet.freeze_panes = 'A2'
-            
+            for row_idx, row_data in enumerate(rows, start=1):
+                worksheet.write_row(row_idx, 0, row_data, data_format)
+
+            # Emit the Powerstate / Config status coloring as native Excel
+            # conditional formatting rules: one rule per column instead of a
+            # Python branch per cell, evaluated by Excel at render time
+            if rows:
+                last_row = len(rows)
+                for col_idx, column_name in enumerate(columns):
+                    # Format Powerstate column (red text for powered off VMs)
+                    if column_name == 'Powerstate':
+                        worksheet.conditional_format(1, col_idx, last_row, col_idx, {
+                            'type': 'cell', 'criteria': '==',
+                            'value': '"poweredOff"', 'format': red_format})
+
+                    # Format Config status column
+                    elif column_name == 'Config status':
+                        for value, color_format in (('green', green_format),
+                                                    ('red', red_format),
+                                                    ('yellow', orange_format)):
+                            worksheet.conditional_format(1, col_idx, last_row, col_idx, {
+                                'type': 'cell', 'criteria': '==',
+                                'value': f'"{value}"', 'format': color_format})
+
             if verbose:
                 print(f"  - Completed processing")
-        
+
         except Exception as e:
             if verbose:
                 print(f"  - Error processing {csv_file}: {str(e)}")
                 print(traceback.format_exc())
             else:
                 print(f"Error processing {csv_file}: {str(e)}")
-    
+
+    executor.shutdown()
+
     # Add metadata sheet
     if verbose:
         print("Adding metadata sheet")
-    
-    metadata_sheet = workbook.create_sheet(title='vMetaData')
-    metadata_sheet['A1'] = 'RVTools major version'
-    metadata_sheet['B1'] = 'RVTools version'
-    metadata_sheet['C1'] = 'xlsx creation datetime'
-    metadata_sheet['D1'] = 'Server'
-    
-    # Add metadata values
-    metadata_sheet['A2'] = 4.4
-    metadata_sheet['B2'] = '4.4.5.0'
-    metadata_sheet['C2'] = datetime.now()
-    metadata_sheet['D2'] = 'Converted by RVTools CSV2Excel Tool'
-    
-    # Reorder sheets to match RVTools standard order if possible
-    if verbose:
-        print("Reordering sheets")
-    
-    # Create a new order based on standard order and what we actually have
-    new_order = []
-    for sheet in STANDARD_SHEET_ORDER:
-        if sheet in processed_sheets or sheet == 'vMetaData':
-            new_order.append(sheet)
-    
-    # Add any sheets we have that aren't in the standard order
-    for sheet in processed_sheets:
-        if sheet not in new_order:
-            new_order.append(sheet)
-    
-    # Add metadata at the end if not already included
-    if 'vMetaData' not in new_order:
-        new_order.append('vMetaData')
-    
-    # Reorder the sheets
-    for i, sheet_name in enumerate(new_order):
-        if sheet_name in workbook.sheetnames:
-            workbook.move_sheet(sheet_name, i)
-    
+
+    metadata_sheet = workbook.add_worksheet(unique_sheet_name('vMetaData', used_sheet_names))
+    metadata_sheet.write_row(0, 0, ['RVTools major version', 'RVTools version',
+                                    'xlsx creation datetime', 'Server'])
+    metadata_sheet.write_row(1, 0, [4.4, '4.4.5.0', datetime.now(),
+                                    'Converted by RVTools CSV2Excel Tool'])
+
     # Save the workbook
     if verbose:
         print(f"Saving workbook to {output_file}")
-    
-    workbook.save(output_file)
-    
+
+    sheet_count = len(workbook.worksheets())
+    workbook.close()
+
     if verbose:
-        print(f"Excel file created with {len(workbook.sheetnames)} sheets")
-    
+        print(f"Excel file created with {sheet_count} sheets")
+
     return output_file
 
 def main():